@@ -4,8 +4,11 @@ Module for solving the Traveling Salesman Problem (TSP) using a branch-and-bound
 Provides functions to compute the optimal tour and total cost for a given directed graph.
 """
 
+import itertools
 import sys
 
+INF = float("inf")
+
 def runNewSolution(dg, start):
     """
     Solves the TSP for the directed graph 'dg' starting from the given vertex.
@@ -18,62 +21,231 @@ def runNewSolution(dg, start):
     Returns:
         tuple: A tuple (best_cost, best_path) where best_path includes the return to the start.
     """
-    visited = [False] * dg.V
-    visited[start] = True
-    best = {"cost": float("inf"), "path": []}
-    tsp_recursive(dg, current=start, start=start, count=1, cost=0,
-                  visited=visited, current_path=[start], best=best)
-    return best["cost"], best["path"]
+    return tsp_iterative(dg, start)
+
+
+def build_weight_matrix(dg):
+    """Flatten the adjacency lists of 'dg' into a row-major weight matrix.
+
+    Missing edges (and edges weighted sys.maxsize, which DGraph.find_node reports the
+    same way) are stored as infinity, so any sum over them never beats a real tour.
+    When an edge was added more than once, the most recently added one wins,
+    matching DGraph.find_node.
+
+    Args:
+        dg (DGraph): The directed graph instance.
+
+    Returns:
+        list: A flat list of length V * V where entry u * V + v is the weight of edge u -> v.
+    """
+    n = dg.V
+    dist = [INF] * (n * n)
+    seen = [False] * (n * n)
+    for u in range(n):
+        row = u * n
+        cur = dg.graph[u]
+        while cur is not None:
+            idx = row + cur.vertex
+            if not seen[idx]:
+                seen[idx] = True
+                if cur.weight != sys.maxsize:
+                    dist[idx] = cur.weight
+            cur = cur.next
+    return dist
+
+
+def build_neighbour_orders(dist, n):
+    """Sort the outgoing edges of every vertex once, cheapest first.
+
+    Ties keep ascending vertex order, the same order the search would get by
+    sorting its candidates at every node.
+
+    Args:
+        dist (list): Flat weight matrix from build_weight_matrix.
+        n (int): The number of vertices.
+
+    Returns:
+        tuple: (order_v, order_w), per-vertex tuples of neighbour indices and their edge weights.
+    """
+    order_v = []
+    order_w = []
+    for u in range(n):
+        row = u * n
+        edges = [(v, dist[row + v]) for v in range(n) if v != u and dist[row + v] != INF]
+        edges.sort(key=lambda x: x[1])
+        order_v.append(tuple(v for v, _ in edges))
+        order_w.append(tuple(w for _, w in edges))
+    return order_v, order_w
+
+
+def build_triple_orders(dist, n, start):
+    """Order every set of three unvisited vertices by edge weight from each vertex.
+
+    Args:
+        dist (list): Flat weight matrix from build_weight_matrix.
+        n (int): The number of vertices.
+        start (int): The starting vertex index.
+
+    Returns:
+        list: Per-vertex dicts mapping the bitmask of the three vertices to a flat
+            tuple (v1, w1, v2, w2, v3, w3), cheapest edge first and ties to the lower index.
+    """
+    triples = [{} for _ in range(n)]
+    for u in range(n):
+        row = u * n
+        others = [v for v in range(n) if v != u and v != start]
+        for combo in itertools.combinations(others, 3):
+            ordered = sorted(combo, key=lambda v: dist[row + v])
+            key = 0
+            entry = []
+            for v in ordered:
+                key |= 1 << v
+                entry += (v, dist[row + v])
+            triples[u][key] = tuple(entry)
+    return triples
 
 
-def tsp_recursive(dg, current, start, count, cost, visited, current_path, best):
-    """Recursive helper function to solve TSP via branch-and-bound.
+def build_pair_finishes(dist, n, start):
+    """Precompute both ways to finish a tour once only two vertices remain.
+
+    Args:
+        dist (list): Flat weight matrix from build_weight_matrix.
+        n (int): The number of vertices.
+        start (int): The starting vertex index.
+
+    Returns:
+        list: Per-vertex dicts keyed by the bitmask of the vertex and the remaining
+            pair {x, y}. Each value holds the two orderings (x, y, w(v, x), w(x, y),
+            w(y, start)) and (y, x, w(v, y), w(y, x), w(x, start)), with x the cheaper
+            first hop and ties going to the lower index.
+    """
+    finishes = [{} for _ in range(n)]
+    for v in range(n):
+        row = v * n
+        others = [x for x in range(n) if x != v and x != start]
+        for x, y in itertools.combinations(others, 2):
+            if dist[row + y] < dist[row + x]:
+                x, y = y, x
+            key = (1 << v) | (1 << x) | (1 << y)
+            finishes[v][key] = ((x, y, dist[row + x], dist[x * n + y], dist[y * n + start]),
+                                (y, x, dist[row + y], dist[y * n + x], dist[x * n + start]))
+    return finishes
+
+
+def tsp_iterative(dg, start):
+    """Branch-and-bound search over an explicit stack.
+
+    The visited set is an integer bitmask, and the path, per-depth cost and
+    per-depth position in the neighbour order live in arrays allocated once.
+    The last three levels of the tree read precomputed orders instead of
+    scanning the neighbour lists. Nodes are visited in the same order and
+    pruned under the same conditions as a depth-first recursion that sorts its
+    candidates by edge weight, so the same optimal tour is returned.
 
     Args:
         dg (DGraph): The directed graph instance.
-        current (int): The current vertex index.
         start (int): The starting vertex index.
-        count (int): The number of vertices visited so far.
-        cost (int): The accumulated travel cost.
-        visited (list): A boolean list indicating visited vertices.
-        current_path (list): The current path represented as a list of vertex indices.
-        best (dict): Dictionary storing the best cost and corresponding path found.
 
     Returns:
-        None: Updates the best solution in place.
+        tuple: A tuple (best_cost, best_path) where best_path includes the return to the start.
     """
-    # Base case: all vertices visited. Complete the cycle by returning to start.
-    if count == dg.V:
-        weight, vertex, _ = dg.find_node(current, start)
-        if weight != sys.maxsize:  # Valid edge exists from current back to start.
-            total_cost = cost + weight
-            if total_cost < best["cost"]:
-                best["cost"] = total_cost
-                best["path"] = current_path[:] + [start]
-        return
-
-    # Prune if current cost already exceeds the best cost found.
-    if cost >= best["cost"]:
-        return
-
-    # Generate candidate moves: iterate over unvisited vertices with a valid edge from current.
-    candidates = []
-    for v in range(dg.V):
-        if not visited[v]:
-            weight, vertex, _ = dg.find_node(current, v)
-            if weight != sys.maxsize:
-                candidates.append((v, weight))
-    # Order candidates by edge weight (heuristic: lower weight first)
-    candidates.sort(key=lambda x: x[1])
-
-    # Explore each candidate recursively.
-    for v, weight in candidates:
-        visited[v] = True
-        current_path.append(v)
-        tsp_recursive(dg, current=v, start=start, count=count + 1, cost=cost + weight,
-                      visited=visited, current_path=current_path, best=best)
-        current_path.pop()
-        visited[v] = False
+    n = dg.V
+    last = n - 1
+    full = (1 << n) - 1
+    dist = build_weight_matrix(dg)
+    # Weight of the closing edge from each vertex back to the start.
+    close = dist[start::n]
+    best_cost = INF
+
+    # Tours of up to three vertices have at most two candidates to compare.
+    if last == 0:
+        if close[start] < best_cost:
+            return close[start], [start, start]
+        return best_cost, []
+    if last == 1:
+        v = 1 - start
+        total = dist[start * n + v] + close[v]
+        if total < best_cost:
+            return total, [start, v, start]
+        return best_cost, []
+    finishes = build_pair_finishes(dist, n, start)
+    if last == 2:
+        best_path = []
+        for x, y, wx, wxy, back in finishes[start][full]:
+            if wx < best_cost and wx + wxy + back < best_cost:
+                best_cost = wx + wxy + back
+                best_path = [start, x, y, start]
+        return best_cost, best_path
+
+    order_v, order_w = build_neighbour_orders(dist, n)
+    triples = build_triple_orders(dist, n, start)
+    bits = [1 << v for v in range(n)]
+    path = [start] * n
+    costs = [0] * n
+    pos = [0] * n
+    best_path = [start] * n
+
+    mask = bits[start]
+    depth = 0
+    while depth >= 0:
+        u = path[depth]
+        base = costs[depth]
+
+        if depth == last - 3:
+            # Three vertices remain: take them in precomputed order, and finish
+            # the tour after each one from the precomputed pair orders.
+            rest = full ^ mask
+            entry = triples[u][rest]
+            k = 0
+            while k < 6:
+                v = entry[k]
+                c = base + entry[k + 1]
+                k += 2
+                # Prune if the partial cost already reaches the best tour found.
+                if c >= best_cost:
+                    continue
+                for x, y, wx, wxy, back in finishes[v][rest]:
+                    if c + wx < best_cost:
+                        total = c + wx + wxy + back
+                        if total < best_cost:
+                            best_cost = total
+                            path[last - 2] = v
+                            path[last - 1] = x
+                            path[last] = y
+                            best_path[:] = path
+            mask ^= bits[u]
+            depth -= 1
+            continue
+
+        nv = order_v[u]
+        nw = order_w[u]
+        cnt = len(nv)
+        i = pos[depth]
+        while i < cnt:
+            v = nv[i]
+            if mask & bits[v]:
+                i += 1
+                continue
+            c = base + nw[i]
+            i += 1
+            # Prune if the partial cost already reaches the best tour found.
+            if c >= best_cost:
+                continue
+            pos[depth] = i
+            depth += 1
+            path[depth] = v
+            costs[depth] = c
+            pos[depth] = 0
+            mask |= bits[v]
+            break
+        else:
+            # Neighbours exhausted: backtrack.
+            mask ^= bits[u]
+            depth -= 1
+
+    if best_cost == INF:
+        return best_cost, []
+    return best_cost, best_path + [start]
 
 
 # # --- Example Usage ---